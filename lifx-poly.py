@@ -8,12 +8,19 @@ import udi_interface
 import time
 import sys
 import lifxlan
-from copy import deepcopy
-import json
 import yaml
-from threading import Thread
+from threading import Thread, Timer, Lock
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import math
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
 
 
 LOGGER = udi_interface.LOGGER
@@ -23,10 +30,19 @@ BR_MIN = 1310          # minimum brightness value ~2%
 BR_MAX = 65535         # maximum brightness value
 FADE_INTERVAL = 5000   # 5s
 BRTDIM_INTERVAL = 400  # 400ms
-
-with open('server.json') as data:
-    SERVERDATA = json.load(data)
-    data.close()
+POLL_WORKERS = 16      # max bulbs polled concurrently
+COALESCE_INTERVAL = 0.05  # 50ms window to merge manual color edits into one packet
+APPLY_INTERVAL = 0.1   # staged SET_HSBKDZ zone edits are applied 100ms after the last edit without APPLY
+RETRY_COUNT = 1        # resends of a lifxlan request, kept low as commands run on the single ISY input thread
+RETRY_BASE = 0.2       # first resend delay in seconds, doubled on each retry
+UNREACHABLE_POLLS = 3  # consecutive failed polls before commands are dropped
+
+# Brightness (0-65535) to ST percent lookup
+_BRI_PCT = tuple(round(i*100/65535, 4) for i in range(65536))
+# DON level (0-255) to clamped bulb brightness lookup
+_DON_BRI = tuple(min(BR_MAX, max(BR_MIN, round(v*65535/255))) for v in range(256))
+
+SERVERDATA = _json_loads(Path('server.json').read_bytes())
 try:
     VERSION = SERVERDATA['credits'][0]['version']
 except (KeyError, ValueError):
@@ -36,19 +52,47 @@ except (KeyError, ValueError):
 
 # Changing these will not update the ISY names and labels, you will have to edit the profile.
 COLORS = {
-    0: ['RED', [62978, 65535, 65535, 3500]],
-    1: ['ORANGE', [5525, 65535, 65535, 3500]],
-    2: ['YELLOW', [7615, 65535, 65535, 3500]],
-    3: ['GREEN', [16173, 65535, 65535, 3500]],
-    4: ['CYAN', [29814, 65535, 65535, 3500]],
-    5: ['BLUE', [43634, 65535, 65535, 3500]],
-    6: ['PURPLE', [50486, 65535, 65535, 3500]],
-    7: ['PINK', [58275, 65535, 47142, 3500]],
-    8: ['WHITE', [58275, 0, 65535, 5500]],
-    9: ['COLD_WHTE', [58275, 0, 65535, 9000]],
-    10: ['WARM_WHITE', [58275, 0, 65535, 3200]],
-    11: ['GOLD', [58275, 0, 65535, 2500]]
+    0: ('RED', (62978, 65535, 65535, 3500)),
+    1: ('ORANGE', (5525, 65535, 65535, 3500)),
+    2: ('YELLOW', (7615, 65535, 65535, 3500)),
+    3: ('GREEN', (16173, 65535, 65535, 3500)),
+    4: ('CYAN', (29814, 65535, 65535, 3500)),
+    5: ('BLUE', (43634, 65535, 65535, 3500)),
+    6: ('PURPLE', (50486, 65535, 65535, 3500)),
+    7: ('PINK', (58275, 65535, 47142, 3500)),
+    8: ('WHITE', (58275, 0, 65535, 5500)),
+    9: ('COLD_WHTE', (58275, 0, 65535, 9000)),
+    10: ('WARM_WHITE', (58275, 0, 65535, 3200)),
+    11: ('GOLD', (58275, 0, 65535, 2500))
 }
+_COLOR_DRIVERS = ('GV1', 'GV2', 'GV3', 'CLITEMP')
+_HSBK_KEYS = ('H.uom56', 'S.uom56', 'B.uom56', 'K.uom26')
+_CMD_TO_IDX = {'SETH': 0, 'SETS': 1, 'SETB': 2, 'CLITEMP': 3}   # setManual command to HSBK index
+_COALESCED_CMDS = frozenset(('SETH', 'SETS', 'SETB', 'CLITEMP', 'RR'))  # edits merged by _schedule_flush
+_STAGED_CMDS = frozenset(('SET_HSBKDZ', 'APPLY'))                   # zone edits sent by MultiZone.apply
+_EXT_MZ_MIN_FW = (2, 77)                  # first firmware with SetExtendedColorZones
+_LEGACY_MZ_PRODUCTS = frozenset((31,))    # first generation LIFX Z, no extended multizone
+_MORPH_HUES = (0, 7281, 10922, 22209, 43507, 49333, 53520)      # Tile Morph effect palette
+_MORPH_K = 3500
+_MAC_TRANS = str.maketrans('', '', ':')    # MAC address to node address
+_GRP_TRANS = str.maketrans('', '', "' ")   # group label to node address
+
+
+def _retry(fn, *args, retries=RETRY_COUNT, base=RETRY_BASE, **kwargs):
+    ''' Call a lifxlan request, resending dropped UDP packets with exponential backoff.
+        Only for reads and absolute setters (power, color, zones), a resent waveform or effect would restart it '''
+    for attempt in range(retries + 1):
+        try:
+            return fn(*args, **kwargs)
+        except (lifxlan.WorkflowException, IOError):
+            if attempt == retries:
+                raise
+            time.sleep(base * 2 ** attempt)
+
+
+def _parse_hsbk(query):
+    ''' Build [hue, saturation, brightness, kelvin] from an ISY command query '''
+    return [int(query.get(k)) for k in _HSBK_KEYS]
 
 
 class Controller(udi_interface.Node):
@@ -63,6 +107,7 @@ class Controller(udi_interface.Node):
         self.change_pon = True
         self.ignore_second_on = False
         self.bulbs_found = 0
+        self._poll_pool = ThreadPoolExecutor(max_workers=POLL_WORKERS)
         self.poly.subscribe(polyglot.START, self.start, address)
         self.poly.subscribe(polyglot.CUSTOMPARAMS, self.parameter_handler)
         self.poly.subscribe(polyglot.CUSTOMDATA, self.data_handler)
@@ -72,7 +117,7 @@ class Controller(udi_interface.Node):
         self.poly.addNode(self)
 
     def start(self):
-        LOGGER.info('Starting LiFX Polyglot v2 NodeServer version {}, LiFX LAN: {}'.format(VERSION, lifxlan.__version__))
+        LOGGER.info('Starting LiFX Polyglot v2 NodeServer version %s, LiFX LAN: %s', VERSION, lifxlan.__version__)
         polyglot.updateProfile()
         self.poly.setCustomParamsDoc()
 
@@ -92,7 +137,8 @@ class Controller(udi_interface.Node):
         self.cust_data.load(data)
 
     def stop(self):
-        LOGGER.info('Stopping LiFX Polyglot v2 NodeServer version {}'.format(VERSION))
+        LOGGER.info('Stopping LiFX Polyglot v2 NodeServer version %s', VERSION)
+        self._poll_pool.shutdown(wait=False)
 
     def poll(self, polltype):
         if self.discovery_thread is not None:
@@ -101,11 +147,12 @@ class Controller(udi_interface.Node):
                 return
             else:
                 self.discovery_thread = None
-        for node in self.poly.getNodes().values():
-            if polltype == 'shortPoll':
-                node.update()
-            else:
-                node.long_update()
+        nodes = [node for node in self.poly.getNodes().values() if node is not self]
+        ''' Bulb queries are blocking UDP round-trips, run them concurrently '''
+        if polltype == 'shortPoll':
+            list(self._poll_pool.map(lambda node: node.update(), nodes))
+        else:
+            list(self._poll_pool.map(lambda node: node.long_update(), nodes))
 
     def update(self):
         pass
@@ -114,86 +161,139 @@ class Controller(udi_interface.Node):
         pass
 
     def discover(self, command=None):
-        self.lifxLan = lifxlan.LifxLAN()
+        ''' On automatic discovery stop listening once the previously seen number of bulbs responded,
+            an explicit DISCOVER command always waits for the full timeout to pick up new bulbs '''
+        expected = self.cust_data['last_bulbs_found'] if command is None else None
+        self.lifxLan = lifxlan.LifxLAN(int(expected)) if expected else lifxlan.LifxLAN()
         if self.discovery_thread is not None:
             if self.discovery_thread.is_alive():
                 LOGGER.info('Discovery is still in progress')
                 return
-        self.discovery_thread = Thread(target=self._discovery_process)
+        self.discovery_thread = Thread(target=self._discovery_process, kwargs={'use_cache': command is None})
         self.discovery_thread.start()
 
     def _manual_discovery(self):
         try:
             f = open(self.parameters['devlist'])
         except Exception as ex:
-            LOGGER.error('Failed to open {}: {}'.format(self.paramaters['devlist'], ex))
-            return False
-        try:
-            data = yaml.safe_load(f.read())
-            f.close()
-        except Exception as ex:
-            LOGGER.error('Failed to parse {} content: {}'.format(self.parameters['devlist'], ex))
+            LOGGER.error('Failed to open %s: %s', self.parameters['devlist'], ex)
             return False
+        with f:
+            try:
+                data = yaml.load(f, Loader=_SafeLoader)
+            except Exception as ex:
+                LOGGER.error('Failed to parse %s content: %s', self.parameters['devlist'], ex)
+                return False
 
         if 'bulbs' not in data:
-            LOGGER.error('Manual discovery file {} is missing bulbs section'.format(self.parameters['devlist']))
+            LOGGER.error('Manual discovery file %s is missing bulbs section', self.parameters['devlist'])
             return False
+        if 'groups' not in data:
+            LOGGER.info('Manual discovery file %s is missing groups section', self.parameters['devlist'])
+        self._add_devlist(data)
+        return True
 
+    def _add_devlist(self, data):
+        ''' Create nodes from a devlist structure, as read from the manual discovery file or cached by automatic discovery '''
         for b in data['bulbs']:
             name = b['name']
-            address = b['mac'].replace(':', '').lower()
+            address = b['mac'].translate(_MAC_TRANS).lower()
             mac = b['mac']
             ip = b['ip']
-            if not self.poly.getNode(address):
+            node = self.poly.getNode(address)
+            if node:
+                ''' Already added by an earlier discovery run, reuse its device for group membership '''
+                b['object'] = node.device
+            else:
                 self.bulbs_found += 1
                 if b['type'] == 'multizone':
                     d = lifxlan.MultiZoneLight(mac, ip)
                     ''' Save object reference if we need it for group membership '''
                     b['object'] = d
-                    LOGGER.info('Found MultiZone Bulb: {}({})'.format(name, address))
+                    LOGGER.info('Found MultiZone Bulb: %s(%s)', name, address)
                     self.poly.addNode(MultiZone(self.poly, self.address, address, name, d))
                 elif b['type'] == 'bulb':
                     d = lifxlan.Light(mac, ip)
                     ''' Save object reference if we need it for group membership '''
                     b['object'] = d
-                    LOGGER.info('Found Bulb: {}({})'.format(name, address))
+                    LOGGER.info('Found Bulb: %s(%s)', name, address)
                     self.poly.addNode(Light(self.poly, self.address, address, name, d))
                 elif b['type'] == 'tile':
                     d = lifxlan.TileChain(mac, ip)
                     ''' Save object reference if we need it for group membership '''
                     b['object'] = d
-                    LOGGER.info('Found Tile: {}({})'.format(name, address))
+                    LOGGER.info('Found Tile: %s(%s)', name, address)
                     self.poly.addNode(Tile(self.poly, self.address, address, name, d))
                 else:
-                    LOGGER.error('Unknown type: {}'.format(b['type']))
+                    LOGGER.error('Unknown type: %s', b['type'])
         self.setDriver('GV0', self.bulbs_found)
 
-        if 'groups' not in data:
-            LOGGER.info('Manual discovery file {} is missing groups section'.format(self.parameters['devlist']))
-            return True
-
-        for grp in data['groups']:
+        bulb_by_name = {b['name']: b for b in data['bulbs']}
+        for grp in data.get('groups', []):
             members = []
             for member_light in grp['members']:
-                light_found = False
-                for b in data['bulbs']:
-                    if b['name'] == member_light:
-                        members.append(b['object'])
-                        light_found = True
-                        break
-                if not light_found:
-                    LOGGER.error('Group {} light {} is not found'.format(grp['name'], member_light))
-            LOGGER.info('Group {}, {} members'.format(grp['name'], len(members)))
+                b = bulb_by_name.get(member_light)
+                if b is None or 'object' not in b:
+                    LOGGER.error('Group %s light %s is not found', grp['name'], member_light)
+                else:
+                    members.append(b['object'])
+            LOGGER.info('Group %s, %s members', grp['name'], len(members))
             if len(members) > 0:
                 gaddress = grp['address']
                 glabel = grp['name']
                 if not self.poly.getNode(gaddress):
-                    LOGGER.info('Found LiFX Group: {}'.format(glabel))
+                    LOGGER.info('Found LiFX Group: %s', glabel)
                     grp = lifxlan.Group(members)
                     self.poly.addNode(Group(self.poly, self.address, gaddress, glabel, grp))
+
+    def _fast_reconnect(self):
+        ''' Recreate nodes from the devlist cached by the previous automatic discovery,
+            every cached bulb must answer or full discovery is required '''
+        cached = self.cust_data['devlist']
+        if not cached.get('bulbs'):
+            return False
+        ''' _add_devlist() stores device objects on the bulb entries, keep those out of customdata '''
+        data = {'bulbs': [dict(b) for b in cached['bulbs']], 'groups': cached.get('groups', [])}
+        devices = [lifxlan.Light(b['mac'], b['ip']) for b in data['bulbs']]
+        try:
+            with ThreadPoolExecutor(max_workers=min(32, len(devices))) as pool:
+                list(pool.map(lambda d: d.get_label(), devices))
+        except (lifxlan.WorkflowException, OSError, IOError, TypeError) as ex:
+            LOGGER.info('Cached bulb did not respond, falling back to full discovery: %s', ex)
+            return False
+        self._add_devlist(data)
         return True
 
-    def _discovery_process(self):
+    def _merge_devlist(self, bulbs, groups, replace=False):
+        ''' Merge this run into the devlist used by _fast_reconnect() on next start, same layout as the
+            manual discovery file. Bulbs that did not answer this time are kept, otherwise a bulb offline
+            during one discovery would never be reconnected again. An explicit DISCOVER replaces the
+            devlist so retired bulbs are dropped '''
+        cached = {} if replace else (self.cust_data['devlist'] or {})
+        merged = {b['mac']: b for b in cached.get('bulbs', [])}
+        merged.update({b['mac']: b for b in bulbs})
+        seen = {b['name'] for b in bulbs}
+        known = {b['name'] for b in merged.values()}
+        merged_groups = {}
+        for grp in cached.get('groups', []):
+            ''' Bulbs seen in this run are re-added below to whatever group they report now '''
+            members = [m for m in grp['members'] if m not in seen and m in known]
+            merged_groups[grp['address']] = dict(grp, members=members)
+        for gaddress, grp in groups.items():
+            old = merged_groups.get(gaddress, {'members': []})
+            merged_groups[gaddress] = dict(grp, members=old['members'] + grp['members'])
+        self.cust_data['devlist'] = {'bulbs': list(merged.values()),
+                                     'groups': [g for g in merged_groups.values() if g['members']]}
+
+    def _probe_device(self, d):
+        ''' Returns None if the bulb did not answer, so one dropped packet does not abort the whole discovery '''
+        try:
+            return str(d.get_label()), d.get_mac_addr(), d.supports_multizone(), d.get_group_tuple()
+        except (lifxlan.WorkflowException, OSError, IOError, TypeError) as ex:
+            LOGGER.error('discovery Error probing %s: %s', d.get_ip_addr(), ex)
+            return None
+
+    def _discovery_process(self, use_cache=False):
         LOGGER.info('Starting LiFX Discovery thread...')
         if self.parameters['devlist']:
             LOGGER.info('Attempting manual discovery...')
@@ -202,28 +302,51 @@ class Controller(udi_interface.Node):
                 return
             else:
                 LOGGER.error('Manual discovery failed')
+        elif use_cache and self.cust_data['devlist']:
+            LOGGER.info('Reconnecting to bulbs from previous discovery...')
+            if self._fast_reconnect():
+                LOGGER.info('Reconnect from cached devlist is complete')
+                return
         try:
             devices = self.lifxLan.get_lights()
-            LOGGER.info('{} bulbs found. Checking status and adding to ISY if necessary.'.format(len(devices)))
-            for d in devices:
-                label = str(d.get_label())
+            LOGGER.info('%s bulbs found. Checking status and adding to ISY if necessary.', len(devices))
+            probes = []
+            if devices:
+                ''' Automatic runs may stop early or miss an offline bulb, only let them raise the expected
+                    count. An explicit DISCOVER listens for the full timeout and resets it '''
+                if use_cache:
+                    self.cust_data['last_bulbs_found'] = max(int(self.cust_data['last_bulbs_found'] or 0), len(devices))
+                else:
+                    self.cust_data['last_bulbs_found'] = len(devices)
+                with ThreadPoolExecutor(max_workers=min(32, len(devices))) as pool:
+                    probes = list(pool.map(self._probe_device, devices))
+            bulbs = []
+            groups = {}
+            for d, probe in zip(devices, probes):
+                if probe is None:
+                    continue
+                label, mac, multizone, group_tuple = probe
                 name = 'LIFX {}'.format(label)
-                address = d.get_mac_addr().replace(':', '').lower()
+                address = mac.translate(_MAC_TRANS).lower()
                 if not self.poly.getNode(address):
                     self.bulbs_found += 1
-                    if d.supports_multizone():
-                        LOGGER.info('Found MultiZone Bulb: {}({})'.format(name, address))
+                    if multizone:
+                        LOGGER.info('Found MultiZone Bulb: %s(%s)', name, address)
                         self.poly.addNode(MultiZone(self.poly, self.address, address, name, d))
                     else:
-                        LOGGER.info('Found Bulb: {}({})'.format(name, address))
+                        LOGGER.info('Found Bulb: %s(%s)', name, address)
                         self.poly.addNode(Light(self.poly, self.address, address, name, d))
-                gid, glabel, gupdatedat = d.get_group_tuple()
-                gaddress = glabel.replace("'", "").replace(' ', '').lower()[:12]
+                gid, glabel, gupdatedat = group_tuple
+                gaddress = glabel.translate(_GRP_TRANS).lower()[:12]
                 if not self.poly.getNode(gaddress):
-                    LOGGER.info('Found LiFX Group: {}'.format(glabel))
+                    LOGGER.info('Found LiFX Group: %s', glabel)
                     self.poly.addNode(Group(self.poly, self.address, gaddress, glabel))
+                bulbs.append({'name': name, 'mac': mac, 'ip': d.get_ip_addr(), 'type': 'multizone' if multizone else 'bulb'})
+                groups.setdefault(gaddress, {'name': glabel, 'address': gaddress, 'members': []})['members'].append(name)
+            if bulbs:
+                self._merge_devlist(bulbs, groups, replace=not use_cache)
         except (lifxlan.WorkflowException, OSError, IOError, TypeError) as ex:
-            LOGGER.error('discovery Error: {}'.format(ex))
+            LOGGER.error('discovery Error: %s', ex)
         self.update_nodes = False
         try:
             old_bulbs_found = int(self.getDriver('GV0'))
@@ -231,7 +354,7 @@ class Controller(udi_interface.Node):
             old_bulbs_found = self.bulbs_found
         else:
             if self.bulbs_found != old_bulbs_found:
-                LOGGER.info('NOTICE: Bulb count {} is different, was {} previously'.format(self.bulbs_found, old_bulbs_found))
+                LOGGER.info('NOTICE: Bulb count %s is different, was %s previously', self.bulbs_found, old_bulbs_found)
         self.setDriver('GV0', self.bulbs_found)
         LOGGER.info('LiFX Discovery thread is complete.')
 
@@ -239,18 +362,18 @@ class Controller(udi_interface.Node):
         try:
             self.lifxLan.set_power_all_lights("on", rapid=True)
         except (lifxlan.WorkflowException, OSError, IOError, TypeError) as ex:
-            LOGGER.error('All On Error: {}'.format(str(ex)))
+            LOGGER.error('All On Error: %s', ex)
 
     def all_off(self, command):
         try:
             self.lifxLan.set_power_all_lights("off", rapid=True)
         except (lifxlan.WorkflowException, OSError, IOError, TypeError) as ex:
-            LOGGER.error('All Off Error: {}'.format(str(ex)))
+            LOGGER.error('All Off Error: %s', ex)
 
     def set_wf(self, command):
         WAVEFORM = ['Saw', 'Sine', 'HalfSine', 'Triangle', 'Pulse']
         query = command.get('query')
-        wf_color = [int(query.get('H.uom56')), int(query.get('S.uom56')), int(query.get('B.uom56')), int(query.get('K.uom26'))]
+        wf_color = _parse_hsbk(query)
         wf_period = int(query.get('PE.uom42'))
         wf_cycles = int(query.get('CY.uom56'))
         wf_duty_cycle = int(query.get('DC.uom56'))
@@ -260,31 +383,31 @@ class Controller(udi_interface.Node):
             wf_form -= 5
         else:
             wf_transient = 0
-        LOGGER.debug('Color tuple: {}, Period: {}, Cycles: {}, Duty cycle: {}, Form: {}, Transient: {}'.format(wf_color, wf_period, wf_cycles, wf_duty_cycle, WAVEFORM[wf_form], wf_transient))
+        LOGGER.debug('Color tuple: %s, Period: %s, Cycles: %s, Duty cycle: %s, Form: %s, Transient: %s', wf_color, wf_period, wf_cycles, wf_duty_cycle, WAVEFORM[wf_form], wf_transient)
         try:
             self.lifxLan.set_waveform_all_lights(wf_transient, wf_color, wf_period, wf_cycles, wf_duty_cycle, wf_form)
         except lifxlan.WorkflowException as ex:
-                LOGGER.error('Connection Error on setting Waveform for all lights: {}'.format(str(ex)))
+                LOGGER.error('Connection Error on setting Waveform for all lights: %s', ex)
 
     def setColor(self, command):
         _color = int(command.get('value'))
         try:
             self.lifxLan.set_color_all_lights(COLORS[_color][1], rapid=True)
         except lifxlan.WorkflowException as ex:
-            LOGGER.error('Connection Error on setting all bulb color: {}'.format(str(ex)))
+            LOGGER.error('Connection Error on setting all bulb color: %s', ex)
 
     def setHSBKD(self, command):
         query = command.get('query')
         try:
-            color = [int(query.get('H.uom56')), int(query.get('S.uom56')), int(query.get('B.uom56')), int(query.get('K.uom26'))]
+            color = _parse_hsbk(query)
             duration = int(query.get('D.uom42'))
-            LOGGER.info('Received manual change, updating all bulb to: {} duration: {}'.format(str(color), duration))
+            LOGGER.info('Received manual change, updating all bulb to: %s duration: %s', color, duration)
         except TypeError:
             duration = 0
         try:
             self.lifxLan.set_color_all_lights(color, duration=duration, rapid=True)
         except lifxlan.WorkflowException as ex:
-                LOGGER.error('Connection Error on setting all bulb color: {}'.format(str(ex)))
+                LOGGER.error('Connection Error on setting all bulb color: %s', ex)
 
     drivers = [{'driver': 'ST', 'value': 1, 'uom': 2},
                {'driver': 'GV0', 'value': 0, 'uom': 56}
@@ -308,11 +431,16 @@ class Light(udi_interface.Node):
         self.name = name
         self.power = False
         self.connected = 1
+        self._failed_polls = 0
         self.uptime = 0
         self.color= []
-        self.lastupdate = time.time()
         self.duration = 0
         self.ir_support = False
+        self._pending_edits = {}
+        self._flush_timer = None
+        self._flush_due = False
+        self._flush_lock = Lock()
+        self._send_lock = Lock()
 
     def start(self):
         try:
@@ -330,18 +458,19 @@ class Light(udi_interface.Node):
     def update(self):
         self.connected = 0
         try:
-            self.color = list(self.device.get_color())
+            self.color = list(_retry(self.device.get_color))
         except Exception as ex:
-            LOGGER.error('Connection Error on getting {} bulb color. This happens from time to time, normally safe to ignore. {}'.format(self.name, str(ex)))
+            LOGGER.error('Connection Error on getting %s bulb color. This happens from time to time, normally safe to ignore. %s', self.name, ex)
             ''' stop here as proceeding without self.color may cause exceptions '''
             self.setDriver('GV5', self.connected)
+            self._failed_polls = 0 if self.connected else self._failed_polls + 1
             return
         else:
             self.connected = 1
-            for ind, driver in enumerate(('GV1', 'GV2', 'GV3', 'CLITEMP')):
-                self.setDriver(driver, self.color[ind])
+            for driver, val in zip(_COLOR_DRIVERS, self.color):
+                self.setDriver(driver, val)
         try:
-            power_now = True if self.device.get_power() == 65535 else False
+            power_now = _retry(self.device.get_power) == 65535
             if self.power != power_now:
                 if power_now:
                     self.reportCmd('DON')
@@ -349,7 +478,7 @@ class Light(udi_interface.Node):
                     self.reportCmd('DOF')
             self.power = power_now
         except Exception as ex:
-            LOGGER.error('Connection Error on getting {} bulb power. This happens from time to time, normally safe to ignore. {}'.format(self.name, str(ex)))
+            LOGGER.error('Connection Error on getting %s bulb power. This happens from time to time, normally safe to ignore. %s', self.name, ex)
         else:
             self.connected = 1
             if self.power:
@@ -358,51 +487,71 @@ class Light(udi_interface.Node):
                 self.setDriver('ST', 0)
         self.setDriver('GV5', self.connected)
         self.setDriver('RR', self.duration)
-        self.lastupdate = time.time()
+        self._failed_polls = 0 if self.connected else self._failed_polls + 1
 
     def long_update(self):
         self.connected = 0
         try:
-            self.uptime = self._nanosec_to_hours(self.device.get_uptime())
-            self.ir_support = self.device.supports_infrared()
+            self.uptime = self._nanosec_to_hours(_retry(self.device.get_uptime))
+            self.ir_support = _retry(self.device.supports_infrared)
         except Exception as ex:
-            LOGGER.error('Connection Error on getting {} bulb uptime. This happens from time to time, normally safe to ignore. {}'.format(self.name, str(ex)))
+            LOGGER.error('Connection Error on getting %s bulb uptime. This happens from time to time, normally safe to ignore. %s', self.name, ex)
         else:
             self.connected = 1
             self.setDriver('GV6', self.uptime)
         if self.ir_support:
             try:
-                ir_brightness = self.device.get_infrared()
+                ir_brightness = _retry(self.device.get_infrared)
             except Exception as ex:
-                LOGGER.error('Connection Error on getting {} bulb Infrared. This happens from time to time, normally safe to ignore. {}'.format(self.name, str(ex)))
+                LOGGER.error('Connection Error on getting %s bulb Infrared. This happens from time to time, normally safe to ignore. %s', self.name, ex)
             else:
                 self.connected = 1
                 self.setDriver('GV7', ir_brightness)
         else:
             self.setDriver('GV7', 0)
         try:
-            wifi_signal = math.floor(10 * math.log10(self.device.get_wifi_signal_mw()) + 0.5)
-        except (lifxlan.WorkflowException, OSError, ValueError) as ex:
-            LOGGER.error('Connection Error on getting {} bulb WiFi signal strength. This happens from time to time, normally safe to ignore. {}'.format(self.name, str(ex)))
+            mw = _retry(self.device.get_wifi_signal_mw)
+        except (lifxlan.WorkflowException, OSError) as ex:
+            LOGGER.error('Connection Error on getting %s bulb WiFi signal strength. This happens from time to time, normally safe to ignore. %s', self.name, ex)
         else:
             self.connected = 1
+            wifi_signal = round(10 * math.log10(mw)) if mw and mw > 0 else 0
             self.setDriver('GV0', wifi_signal)
         self.setDriver('GV5', self.connected)
-        self.lastupdate = time.time()
+        self._failed_polls = 0 if self.connected else self._failed_polls + 1
+
+    def runCmd(self, command):
+        fn = self.commands.get(command.get('cmd'))
+        if fn is None:
+            super().runCmd(command)
+            return
+        ''' A single failed poll is normal, only once the bulb missed UNREACHABLE_POLLS polls in a row
+            (or its color was never read) would every command just run into UDP timeouts.
+            QUERY is still allowed as it is how the bulb reconnects '''
+        if command.get('cmd') != 'QUERY' and (self._failed_polls >= UNREACHABLE_POLLS or not self.color):
+            LOGGER.info('%s disconnected, dropping %s', self.name, command.get('cmd'))
+            return
+        self._flush_pending(command.get('cmd'))
+        fn(self, command)
+
+    def _flush_pending(self, cmd):
+        ''' Send whatever the Timer threads still hold before cmd runs, so commands keep their order '''
+        if cmd not in _COALESCED_CMDS:
+            self._flush_now()
 
     def _nanosec_to_hours(self, ns):
         return int(round(ns/(1000000000.0*60*60)))
 
     def _bri_to_percent(self, bri):
-        return float(round(bri*100/65535, 4))
+        return _BRI_PCT[int(bri)]
 
     def _power_on_change(self):
         if not self.controller.change_pon or self.power:
             return
         try:
-            self.device.set_power(True)
-        except lifxlan.WorkflowException as ex:
-            LOGGER.error('Connection Error on setting {} bulb power. This happens from time to time, normally safe to ignore. {}'.format(self.name, str(ex)))
+            _retry(self.device.set_power, True)
+        except (lifxlan.WorkflowException, IOError) as ex:
+            LOGGER.error('Connection Error on setting %s bulb power. This happens from time to time, normally safe to ignore. %s', self.name, ex)
         else:
             self.power = True
             self.setDriver('ST', self._bri_to_percent(self.color[2]))
@@ -415,14 +564,10 @@ class Light(udi_interface.Node):
             new_bri = BR_MAX
             trans = 0
         elif cmd == 'DON' and val is not None:
-            new_bri = int(round(int(val)*65535/255))
-            if new_bri > BR_MAX:
-                new_bri = BR_MAX
-            elif new_bri < BR_MIN:
-                new_bri = BR_MIN
+            new_bri = _DON_BRI[max(0, min(255, int(val)))]
             trans = self.duration
         elif self.power and self.controller.ignore_second_on:
-            LOGGER.info('{} is already On, ignoring DON'.format(self.name))
+            LOGGER.info('%s is already On, ignoring DON', self.name)
             return
         elif self.power and self.color[2] != BR_MAX:
             new_bri = BR_MAX
@@ -430,39 +575,42 @@ class Light(udi_interface.Node):
         if new_bri is not None:
             self.color[2] = new_bri
             try:
-                self.device.set_color(self.color, trans, rapid=False)
+                _retry(self.device.set_color, self.color, trans, rapid=False)
             except lifxlan.WorkflowException as ex:
-                LOGGER.error('Connection Error DON {} bulb. This happens from time to time, normally safe to ignore. {}'.format(self.name, str(ex)))
+                LOGGER.error('Connection Error DON %s bulb. This happens from time to time, normally safe to ignore. %s', self.name, ex)
             else:
                 self.setDriver('GV3', self.color[2])
         try:
-            self.device.set_power(True)
+            _retry(self.device.set_power, True)
         except lifxlan.WorkflowException as ex:
-            LOGGER.error('Connection Error on setting {} bulb power. This happens from time to time, normally safe to ignore. {}'.format(self.name, str(ex)))
+            LOGGER.error('Connection Error on setting %s bulb power. This happens from time to time, normally safe to ignore. %s', self.name, ex)
         else:
             self.power = True
             self.setDriver('ST', self._bri_to_percent(self.color[2]))
 
     def setOff(self, command):
         try:
-            self.device.set_power(False)
+            _retry(self.device.set_power, False)
         except lifxlan.WorkflowException as ex:
-            LOGGER.error('Connection Error on setting {} bulb power. This happens from time to time, normally safe to ignore. {}'.format(self.name, str(ex)))
+            LOGGER.error('Connection Error on setting %s bulb power. This happens from time to time, normally safe to ignore. %s', self.name, ex)
         else:
             self.power = False
             self.setDriver('ST', 0)
 
     def dim(self, command):
         if self.power is False:
-            LOGGER.info('{} is off, ignoring DIM'.format(self.name))
+            LOGGER.info('%s is off, ignoring DIM', self.name)
         new_bri = self.color[2] - BR_INCREMENT
         if new_bri < BR_MIN:
             new_bri = BR_MIN
+        if new_bri == self.color[2]:
+            LOGGER.debug('%s is already at minimum, ignoring DIM', self.name)
+            return
         self.color[2] = new_bri
         try:
-            self.device.set_color(self.color, BRTDIM_INTERVAL, rapid=False)
+            _retry(self.device.set_color, self.color, BRTDIM_INTERVAL, rapid=False)
         except lifxlan.WorkflowException as ex:
-            LOGGER.error('Connection Error on dimming {} bulb. This happens from time to time, normally safe to ignore. {}'.format(self.name, str(ex)))
+            LOGGER.error('Connection Error on dimming %s bulb. This happens from time to time, normally safe to ignore. %s', self.name, ex)
         else:
             self.setDriver('ST', self._bri_to_percent(self.color[2]))
             self.setDriver('GV3', self.color[2])
@@ -472,10 +620,10 @@ class Light(udi_interface.Node):
             # Bulb is currently off, let's turn it on ~2%
             self.color[2] = BR_MIN
             try:
-                self.device.set_color(self.color, 0, rapid=False)
-                self.device.set_power(True)
+                _retry(self.device.set_color, self.color, 0, rapid=False)
+                _retry(self.device.set_power, True)
             except lifxlan.WorkflowException as ex:
-                LOGGER.error('Connection Error on brightnening {} bulb. This happens from time to time, normally safe to ignore. {}'.format(self.name, str(ex)))
+                LOGGER.error('Connection Error on brightnening %s bulb. This happens from time to time, normally safe to ignore. %s', self.name, ex)
             else:
                 self.power = True
                 self.setDriver('ST', self._bri_to_percent(self.color[2]))
@@ -483,11 +631,14 @@ class Light(udi_interface.Node):
         new_bri = self.color[2] + BR_INCREMENT
         if new_bri > BR_MAX:
             new_bri = BR_MAX
+        if new_bri == self.color[2]:
+            LOGGER.debug('%s is already at maximum, ignoring BRT', self.name)
+            return
         self.color[2] = new_bri
         try:
-            self.device.set_color(self.color, BRTDIM_INTERVAL, rapid=False)
+            _retry(self.device.set_color, self.color, BRTDIM_INTERVAL, rapid=False)
         except lifxlan.WorkflowException as ex:
-            LOGGER.error('Connection Error on dimming {} bulb. This happens from time to time, normally safe to ignore. {}'.format(self.name, str(ex)))
+            LOGGER.error('Connection Error on dimming %s bulb. This happens from time to time, normally safe to ignore. %s', self.name, ex)
         else:
             self.setDriver('ST', self._bri_to_percent(self.color[2]))
             self.setDriver('GV3', self.color[2])
@@ -497,134 +648,165 @@ class Light(udi_interface.Node):
             # Bulb is currently off, let's turn it on ~2%
             self.color[2] = BR_MIN
             try:
-                self.device.set_color(self.color, 0, rapid=False)
-                self.device.set_power(True)
+                _retry(self.device.set_color, self.color, 0, rapid=False)
+                _retry(self.device.set_power, True)
             except lifxlan.WorkflowException as ex:
-                LOGGER.error('Connection Error on brightnening {} bulb. This happens from time to time, normally safe to ignore. {}'.format(self.name, str(ex)))
+                LOGGER.error('Connection Error on brightnening %s bulb. This happens from time to time, normally safe to ignore. %s', self.name, ex)
             else:
                 self.power = True
                 self.setDriver('ST', self._bri_to_percent(self.color[2]))
         if self.color[2] == BR_MAX:
-            LOGGER.info('{} Can not FadeUp, already at maximum'.format(self.name))
+            LOGGER.info('%s Can not FadeUp, already at maximum', self.name)
             return
         self.color[2] = BR_MAX
         try:
-            self.device.set_color(self.color, FADE_INTERVAL, rapid=False)
+            _retry(self.device.set_color, self.color, FADE_INTERVAL, rapid=False)
         except lifxlan.WorkflowException as ex:
-            LOGGER.error('Connection Error {} bulb Fade Up. This happens from time to time, normally safe to ignore. {}'.format(self.name, str(ex)))
+            LOGGER.error('Connection Error %s bulb Fade Up. This happens from time to time, normally safe to ignore. %s', self.name, ex)
 
     def fade_down(self, command):
         if self.power is False:
-            LOGGER.error('{} can not FadeDown as it is currently off'.format(self.name))
+            LOGGER.error('%s can not FadeDown as it is currently off', self.name)
             return
         if self.color[2] <= BR_MIN:
-            LOGGER.error('{} can not FadeDown as it is currently at minimum'.format(self.name))
+            LOGGER.error('%s can not FadeDown as it is currently at minimum', self.name)
             return
         self.color[2] = BR_MIN
         try:
-            self.device.set_color(self.color, FADE_INTERVAL, rapid=False)
+            _retry(self.device.set_color, self.color, FADE_INTERVAL, rapid=False)
         except lifxlan.WorkflowException as ex:
-            LOGGER.error('Connection Error {} bulb Fade Down. This happens from time to time, normally safe to ignore. {}'.format(self.name, str(ex)))
+            LOGGER.error('Connection Error %s bulb Fade Down. This happens from time to time, normally safe to ignore. %s', self.name, ex)
 
     def fade_stop(self, command):
         if self.power is False:
-            LOGGER.error('{} can not FadeStop as it is currently off'.format(self.name))
+            LOGGER.error('%s can not FadeStop as it is currently off', self.name)
             return
         # check current brightness level
         try:
-            self.color = list(self.device.get_color())
+            self.color = list(_retry(self.device.get_color))
         except Exception as ex:
-            LOGGER.error('Connection Error on getting {} bulb color. This happens from time to time, normally safe to ignore. {}'.format(self.name, str(ex)))
+            LOGGER.error('Connection Error on getting %s bulb color. This happens from time to time, normally safe to ignore. %s', self.name, ex)
         else:
-            for ind, driver in enumerate(('GV1', 'GV2', 'GV3', 'CLITEMP')):
-                self.setDriver(driver, self.color[ind])
+            for driver, val in zip(_COLOR_DRIVERS, self.color):
+                self.setDriver(driver, val)
         if self.color[2] == BR_MIN or self.color[2] == BR_MAX:
-            LOGGER.error('{} can not FadeStop as it is currently at limit'.format(self.name))
+            LOGGER.error('%s can not FadeStop as it is currently at limit', self.name)
             return
         try:
-            self.device.set_color(self.color, 0, rapid=False)
+            _retry(self.device.set_color, self.color, 0, rapid=False)
         except lifxlan.WorkflowException as ex:
-            LOGGER.error('Connection Error {} bulb Fade Stop. This happens from time to time, normally safe to ignore. {}'.format(self.name, str(ex)))
+            LOGGER.error('Connection Error %s bulb Fade Stop. This happens from time to time, normally safe to ignore. %s', self.name, ex)
 
     def setColor(self, command):
-        if self.connected:
-            _color = int(command.get('value'))
-            try:
-                self.device.set_color(COLORS[_color][1], duration=self.duration, rapid=False)
-            except lifxlan.WorkflowException as ex:
-                LOGGER.error('Connection Error on setting {} bulb color. This happens from time to time, normally safe to ignore. {}'.format(self.name, str(ex)))
-            LOGGER.info('Received SetColor command from ISY. Changing color to: {}'.format(COLORS[_color][0]))
-            for ind, driver in enumerate(('GV1', 'GV2', 'GV3', 'CLITEMP')):
-                self.setDriver(driver, COLORS[_color][1][ind])
-            self._power_on_change()
-        else:
-            LOGGER.error('Received SetColor, however the bulb is in a disconnected state... ignoring')
+        _color = int(command.get('value'))
+        try:
+            _retry(self.device.set_color, COLORS[_color][1], duration=self.duration, rapid=False)
+        except lifxlan.WorkflowException as ex:
+            LOGGER.error('Connection Error on setting %s bulb color. This happens from time to time, normally safe to ignore. %s', self.name, ex)
+        LOGGER.info('Received SetColor command from ISY. Changing color to: %s', COLORS[_color][0])
+        for driver, val in zip(_COLOR_DRIVERS, COLORS[_color][1]):
+            self.setDriver(driver, val)
+        self._power_on_change()
 
     def setManual(self, command):
-        if self.connected:
-            _cmd = command.get('cmd')
-            _val = int(command.get('value'))
-            if _cmd == 'SETH':
-                self.color[0] = _val
-                driver = ['GV1', self.color[0]]
-            elif _cmd == 'SETS':
-                self.color[1] = _val
-                driver = ['GV2', self.color[1]]
-            elif _cmd == 'SETB':
-                self.color[2] = _val
-                driver = ['GV3', self.color[2]]
-            elif _cmd == 'CLITEMP':
-                self.color[3] = _val
-                driver = ['CLITEMP', self.color[3]]
-            elif _cmd == 'RR':
-                self.duration = _val
-                driver = ['RR', self.duration]
-            try:
-                self.device.set_color(self.color, self.duration, rapid=False)
-            except lifxlan.WorkflowException as ex:
-                LOGGER.error('Connection Error on setting {} bulb {}. This happens from time to time, normally safe to ignore. {}'.format(self.name, _cmd, str(ex)))
-            LOGGER.info('Received manual change, updating the bulb to: {} duration: {}'.format(str(self.color), self.duration))
-            if driver:
-                self.setDriver(driver[0], driver[1])
-            self._power_on_change()
-        else: LOGGER.info('Received manual change, however the bulb is in a disconnected state... ignoring')
+        _cmd = command.get('cmd')
+        _val = int(command.get('value'))
+        ind = _CMD_TO_IDX.get(_cmd)
+        driver = None
+        if _cmd == 'RR':
+            self.duration = _val
+            driver = ['RR', self.duration]
+        if ind is not None:
+            self.color[ind] = _val
+            with self._flush_lock:
+                self._pending_edits[ind] = _val
+            driver = [_COLOR_DRIVERS[ind], _val]
+        self._schedule_flush()
+        if driver:
+            self.setDriver(driver[0], driver[1])
+
+    def _schedule_flush(self):
+        ''' (Re)arm the timer so edits arriving within COALESCE_INTERVAL go out as one packet '''
+        with self._flush_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+            self._flush_timer = Timer(COALESCE_INTERVAL, self._send_flush)
+            self._flush_timer.daemon = True
+            self._flush_due = True
+            self._flush_timer.start()
+
+    def _flush_now(self):
+        ''' Send coalesced edits on the input thread before any other command, so they keep their order
+            and the Timer thread is not using the device socket at the same time '''
+        with self._flush_lock:
+            timer, self._flush_timer = self._flush_timer, None
+        if timer is None:
+            return
+        timer.cancel()
+        ''' If the timer already fired, wait for its flush to finish instead of sending twice '''
+        timer.join()
+        if self._flush_due:
+            self._send_flush()
+
+    def _send_flush(self):
+        ''' A timer re-armed while the previous flush is still retrying must not drive the device alongside it '''
+        with self._send_lock:
+            self._flush_color()
+
+    def _take_pending_edits(self):
+        with self._flush_lock:
+            self._flush_due = False
+            edits, self._pending_edits = self._pending_edits, {}
+        return edits
+
+    def _flush_color(self):
+        ''' Edits are re-applied on top of self.color as a poll may have refreshed it meanwhile '''
+        for ind, val in self._take_pending_edits().items():
+            self.color[ind] = val
+        try:
+            _retry(self.device.set_color, self.color, self.duration, rapid=False)
+        except (lifxlan.WorkflowException, IOError) as ex:
+            LOGGER.error('Connection Error on setting %s bulb color. This happens from time to time, normally safe to ignore. %s', self.name, ex)
+        LOGGER.info('Received manual change, updating the bulb to: %s duration: %s', self.color, self.duration)
+        ''' Power on only after the new color is sent, so the bulb does not come up with the old one '''
+        self._power_on_change()
 
     def setHSBKD(self, command):
         query = command.get('query')
         try:
-            self.color = [int(query.get('H.uom56')), int(query.get('S.uom56')), int(query.get('B.uom56')), int(query.get('K.uom26'))]
+            self.color = _parse_hsbk(query)
             self.duration = int(query.get('D.uom42'))
-            LOGGER.info('Received manual change, updating the bulb to: {} duration: {}'.format(str(self.color), self.duration))
+            LOGGER.info('Received manual change, updating the bulb to: %s duration: %s', self.color, self.duration)
         except TypeError:
             self.duration = 0
         try:
-            self.device.set_color(self.color, duration=self.duration, rapid=False)
+            _retry(self.device.set_color, self.color, duration=self.duration, rapid=False)
         except lifxlan.WorkflowException as ex:
-                LOGGER.error('Connection Error on setting {} bulb color. This happens from time to time, normally safe to ignore. {}'.format(self.name, str(ex)))
-        for ind, driver in enumerate(('GV1', 'GV2', 'GV3', 'CLITEMP')):
-            self.setDriver(driver, self.color[ind])
+                LOGGER.error('Connection Error on setting %s bulb color. This happens from time to time, normally safe to ignore. %s', self.name, ex)
+        for driver, val in zip(_COLOR_DRIVERS, self.color):
+            self.setDriver(driver, val)
         self._power_on_change()
         self.setDriver('RR', self.duration)
 
     def set_ir_brightness(self, command):
         _val = int(command.get('value'))
         if not self.ir_support:
-            LOGGER.error('{} is not IR capable'.format(self.name))
+            LOGGER.error('%s is not IR capable', self.name)
             return
         try:
             self.device.set_infrared(_val)
         except lifxlan.WorkflowException as ex:
-            LOGGER.error('Connection Error on setting {} bulb IR Brightness. This happens from time to time, normally safe to ignore. {}'.format(self.name, str(ex)))
+            LOGGER.error('Connection Error on setting %s bulb IR Brightness. This happens from time to time, normally safe to ignore. %s', self.name, ex)
         else:
             self.setDriver('GV7', _val)
 
     def set_wf(self, command):
         WAVEFORM = ['Saw', 'Sine', 'HalfSine', 'Triangle', 'Pulse']
         if self.power is False:
-            LOGGER.error('{} can not run Waveform as it is currently off'.format(self.name))
+            LOGGER.error('%s can not run Waveform as it is currently off', self.name)
             return
         query = command.get('query')
-        wf_color = [int(query.get('H.uom56')), int(query.get('S.uom56')), int(query.get('B.uom56')), int(query.get('K.uom26'))]
+        wf_color = _parse_hsbk(query)
         wf_period = int(query.get('PE.uom42'))
         wf_cycles = int(query.get('CY.uom56'))
         wf_duty_cycle = int(query.get('DC.uom56'))
@@ -634,11 +816,11 @@ class Light(udi_interface.Node):
             wf_form -= 5
         else:
             wf_transient = 0
-        LOGGER.debug('Color tuple: {}, Period: {}, Cycles: {}, Duty cycle: {}, Form: {}, Transient: {}'.format(wf_color, wf_period, wf_cycles, wf_duty_cycle, WAVEFORM[wf_form], wf_transient))
+        LOGGER.debug('Color tuple: %s, Period: %s, Cycles: %s, Duty cycle: %s, Form: %s, Transient: %s', wf_color, wf_period, wf_cycles, wf_duty_cycle, WAVEFORM[wf_form], wf_transient)
         try:
             self.device.set_waveform(wf_transient, wf_color, wf_period, wf_cycles, wf_duty_cycle, wf_form)
         except lifxlan.WorkflowException as ex:
-                LOGGER.error('Connection Error on setting {} bulb Waveform. This happens from time to time, normally safe to ignore. {}'.format(self.name, str(ex)))
+                LOGGER.error('Connection Error on setting %s bulb Waveform. This happens from time to time, normally safe to ignore. %s', self.name, ex)
 
     drivers = [{'driver': 'ST', 'value': 0, 'uom': 51},
                 {'driver': 'GV0', 'value': 0, 'uom': 56},
@@ -672,28 +854,29 @@ class MultiZone(Light):
         self.current_zone = 0
         self.new_color = None
         self.pending = False
+        self._apply_timer = None
+        self.extended_mz = False
         self.effect = 0
 
     def update(self):
         self.connected = 0
-        zone = deepcopy(self.current_zone)
-        if self.current_zone != 0: zone -= 1
+        zone = self.current_zone - 1 if self.current_zone else 0
         if not self.pending:
             try:
-                self.color = self.device.get_color_zones()
+                self.color = _retry(self.device.get_color_zones)
             except Exception as ex:
-                LOGGER.error('Connection Error on getting {} multizone color. This happens from time to time, normally safe to ignore. {}'.format(self.name, str(ex)))
+                LOGGER.error('Connection Error on getting %s multizone color. This happens from time to time, normally safe to ignore. %s', self.name, ex)
             else:
                 self.connected = 1
                 self.num_zones = len(self.color)
-                for ind, driver in enumerate(('GV1', 'GV2', 'GV3', 'CLITEMP')):
-                    try:
-                        self.setDriver(driver, self.color[zone][ind])
-                    except (TypeError) as e:
-                        LOGGER.debug('setDriver for color caught an error. color was : {}'.format(self.color or None))
+                try:
+                    for driver, val in zip(_COLOR_DRIVERS, self.color[zone]):
+                        self.setDriver(driver, val)
+                except (TypeError) as e:
+                    LOGGER.debug('setDriver for color caught an error. color was : %s', self.color or None)
                 self.setDriver('GV4', self.current_zone)
         try:
-            power_now = True if self.device.get_power() == 65535 else False
+            power_now = _retry(self.device.get_power) == 65535
             if self.power != power_now:
                 if power_now:
                     self.reportCmd('DON')
@@ -701,21 +884,18 @@ class MultiZone(Light):
                     self.reportCmd('DOF')
             self.power = power_now
         except Exception as ex:
-            LOGGER.error('Connection Error on getting {} multizone power. This happens from time to time, normally safe to ignore. {}'.format(self.name, str(ex)))
+            LOGGER.error('Connection Error on getting %s multizone power. This happens from time to time, normally safe to ignore. %s', self.name, ex)
         else:
             self.connected = 1
             self._set_st()
         self.setDriver('GV5', self.connected)
         self.setDriver('RR', self.duration)
-        self.lastupdate = time.time()
+        self._failed_polls = 0 if self.connected else self._failed_polls + 1
 
     def _set_st(self):
         if self.num_zones == 0: return
         if self.power:
-            avg_brightness = 0
-            for z in self.color:
-                avg_brightness += z[2]
-            avg_brightness /= self.num_zones
+            avg_brightness = sum(z[2] for z in self.color) // self.num_zones
             self.setDriver('ST', self._bri_to_percent(avg_brightness))
         else:
             self.setDriver('ST', 0)
@@ -729,12 +909,24 @@ class MultiZone(Light):
             self.current_zone = int(self.getDriver('GV4'))
         except:
             self.current_zone = 0
+        self.extended_mz = self._supports_extended_mz()
         self.update()
         self.long_update()
 
+    def _supports_extended_mz(self):
+        ''' Strips that can't take SetExtendedColorZones silently ignore it, check once and fall back
+            to set_zone_colors for those, or if the bulb did not answer '''
+        try:
+            product = _retry(self.device.get_product)
+            ''' get_host_firmware_version() returns a float, 2.80 would come back as 2.8 '''
+            version = _retry(self.device.req_with_resp, lifxlan.GetHostFirmware, lifxlan.StateHostFirmware).version
+        except (lifxlan.WorkflowException, OSError, TypeError) as ex:
+            LOGGER.error('Connection Error on getting %s firmware version, using legacy zone updates. %s', self.name, ex)
+            return False
+        return product not in _LEGACY_MZ_PRODUCTS and (version >> 16, version & 0xffff) >= _EXT_MZ_MIN_FW
+
     def setOn(self, command):
-        zone = deepcopy(self.current_zone)
-        if self.current_zone != 0: zone -= 1
+        zone = self.current_zone - 1 if self.current_zone else 0
         cmd = command.get('cmd')
         val = command.get('value')
         new_bri = None
@@ -742,11 +934,7 @@ class MultiZone(Light):
             new_bri = BR_MAX
             trans = 0
         elif cmd == 'DON' and val is not None:
-            new_bri = int(round(int(val)*65535/255))
-            if new_bri > BR_MAX:
-                new_bri = BR_MAX
-            elif new_bri < BR_MIN:
-                new_bri = BR_MIN
+            new_bri = _DON_BRI[max(0, min(255, int(val)))]
             trans = self.duration
         elif self.power and self.color[zone][2] != BR_MAX:
             new_bri = BR_MAX
@@ -756,57 +944,58 @@ class MultiZone(Light):
             new_color[2] = new_bri
             try:
                 if self.current_zone == 0:
-                    self.device.set_color(new_color, trans, rapid=False)
+                    _retry(self.device.set_color, new_color, trans, rapid=False)
                 else:
-                    self.device.set_zone_color(zone, zone, new_color, trans, rapid=False)
+                    _retry(self.device.set_zone_color, zone, zone, new_color, trans, rapid=False)
             except lifxlan.WorkflowException as ex:
-                LOGGER.error('Connection Error DON {} bulb. This happens from time to time, normally safe to ignore. {}'.format(self.name, str(ex)))
+                LOGGER.error('Connection Error DON %s bulb. This happens from time to time, normally safe to ignore. %s', self.name, ex)
             else:
                 self.setDriver('GV3', new_color[2])
         try:
-            self.device.set_power(True)
+            _retry(self.device.set_power, True)
         except lifxlan.WorkflowException as ex:
-            LOGGER.error('Connection Error on setting {} bulb power. This happens from time to time, normally safe to ignore. {}'.format(self.name, str(ex)))
+            LOGGER.error('Connection Error on setting %s bulb power. This happens from time to time, normally safe to ignore. %s', self.name, ex)
         else:
             self.power = True
             self._set_st()
 
     def dim(self, command):
-        zone = deepcopy(self.current_zone)
-        if self.current_zone != 0: zone -= 1
+        zone = self.current_zone - 1 if self.current_zone else 0
         if self.power is False:
-            LOGGER.info('{} is off, ignoring DIM'.format(self.name))
+            LOGGER.info('%s is off, ignoring DIM', self.name)
         new_bri = self.color[zone][2] - BR_INCREMENT
         if new_bri < BR_MIN:
             new_bri = BR_MIN
+        if new_bri == self.color[zone][2]:
+            LOGGER.debug('%s is already at minimum, ignoring DIM', self.name)
+            return
         new_color = list(self.color[zone])
         new_color[2] = new_bri
         try:
             if self.current_zone == 0:
-                self.device.set_color(new_color, BRTDIM_INTERVAL, rapid=False)
+                _retry(self.device.set_color, new_color, BRTDIM_INTERVAL, rapid=False)
             else:
-                self.device.set_zone_color(zone, zone, new_color, BRTDIM_INTERVAL, rapid=False)
+                _retry(self.device.set_zone_color, zone, zone, new_color, BRTDIM_INTERVAL, rapid=False)
         except lifxlan.WorkflowException as ex:
-            LOGGER.error('Connection Error on dimming {} bulb. This happens from time to time, normally safe to ignore. {}'.format(self.name, str(ex)))
+            LOGGER.error('Connection Error on dimming %s bulb. This happens from time to time, normally safe to ignore. %s', self.name, ex)
         else:
             self._set_st()
             self.setDriver('GV3', new_color[2])
 
     def brighten(self, command):
-        zone = deepcopy(self.current_zone)
-        if self.current_zone != 0: zone -= 1
+        zone = self.current_zone - 1 if self.current_zone else 0
         new_color = list(self.color[zone])
         if self.power is False:
             # Bulb is currently off, let's turn it on ~2%
             new_color[2] = BR_MIN
             try:
                 if self.current_zone == 0:
-                    self.device.set_color(new_color, 0, rapid=False)
+                    _retry(self.device.set_color, new_color, 0, rapid=False)
                 else:
-                    self.device.set_zone_color(zone, zone, new_color, 0, rapid=False)
-                self.device.set_power(True)
+                    _retry(self.device.set_zone_color, zone, zone, new_color, 0, rapid=False)
+                _retry(self.device.set_power, True)
             except lifxlan.WorkflowException as ex:
-                LOGGER.error('Connection Error on brightnening {} bulb. This happens from time to time, normally safe to ignore. {}'.format(self.name, str(ex)))
+                LOGGER.error('Connection Error on brightnening %s bulb. This happens from time to time, normally safe to ignore. %s', self.name, ex)
             else:
                 self.power = True
                 self._set_st()
@@ -814,179 +1003,222 @@ class MultiZone(Light):
         new_bri = self.color[zone][2] + BR_INCREMENT
         if new_bri > BR_MAX:
             new_bri = BR_MAX
+        if new_bri == self.color[zone][2]:
+            LOGGER.debug('%s is already at maximum, ignoring BRT', self.name)
+            return
         new_color[2] = new_bri
         try:
             if self.current_zone == 0:
-                self.device.set_color(new_color, BRTDIM_INTERVAL, rapid=False)
+                _retry(self.device.set_color, new_color, BRTDIM_INTERVAL, rapid=False)
             else:
-                self.device.set_zone_color(zone, zone, new_color, BRTDIM_INTERVAL, rapid=False)
+                _retry(self.device.set_zone_color, zone, zone, new_color, BRTDIM_INTERVAL, rapid=False)
         except lifxlan.WorkflowException as ex:
-            LOGGER.error('Connection Error on dimming {} bulb. This happens from time to time, normally safe to ignore. {}'.format(self.name, str(ex)))
+            LOGGER.error('Connection Error on dimming %s bulb. This happens from time to time, normally safe to ignore. %s', self.name, ex)
         else:
             self._set_st()
             self.setDriver('GV3', new_color[2])
 
     def fade_up(self, command):
-        zone = deepcopy(self.current_zone)
-        if self.current_zone != 0: zone -= 1
+        zone = self.current_zone - 1 if self.current_zone else 0
         new_color = list(self.color[zone])
         if self.power is False:
             # Bulb is currently off, let's turn it on ~2%
             new_color[2] = BR_MIN
             try:
                 if self.current_zone == 0:
-                    self.device.set_color(new_color, 0, rapid=False)
+                    _retry(self.device.set_color, new_color, 0, rapid=False)
                 else:
-                    self.device.set_zone_color(zone, zone, new_color, 0, rapid=False)
-                self.device.set_power(True)
+                    _retry(self.device.set_zone_color, zone, zone, new_color, 0, rapid=False)
+                _retry(self.device.set_power, True)
             except lifxlan.WorkflowException as ex:
-                LOGGER.error('Connection Error on brightnening {} bulb. This happens from time to time, normally safe to ignore. {}'.format(self.name, str(ex)))
+                LOGGER.error('Connection Error on brightnening %s bulb. This happens from time to time, normally safe to ignore. %s', self.name, ex)
             else:
                 self.power = True
                 self._set_st()
         if self.color[zone][2] == BR_MAX:
-            LOGGER.info('{} Can not FadeUp, already at maximum'.format(self.name))
+            LOGGER.info('%s Can not FadeUp, already at maximum', self.name)
             return
         new_color[2] = BR_MAX
         try:
             if self.current_zone == 0:
-                self.device.set_color(new_color, FADE_INTERVAL, rapid=False)
+                _retry(self.device.set_color, new_color, FADE_INTERVAL, rapid=False)
             else:
-                self.device.set_zone_color(zone, zone, new_color, FADE_INTERVAL, rapid=False)
+                _retry(self.device.set_zone_color, zone, zone, new_color, FADE_INTERVAL, rapid=False)
         except lifxlan.WorkflowException as ex:
-            LOGGER.error('Connection Error {} bulb Fade Up. This happens from time to time, normally safe to ignore. {}'.format(self.name, str(ex)))
+            LOGGER.error('Connection Error %s bulb Fade Up. This happens from time to time, normally safe to ignore. %s', self.name, ex)
 
     def fade_down(self, command):
-        zone = deepcopy(self.current_zone)
-        if self.current_zone != 0: zone -= 1
+        zone = self.current_zone - 1 if self.current_zone else 0
         new_color = list(self.color[zone])
         if self.power is False:
-            LOGGER.error('{} can not FadeDown as it is currently off'.format(self.name))
+            LOGGER.error('%s can not FadeDown as it is currently off', self.name)
             return
         if self.color[zone][2] <= BR_MIN:
-            LOGGER.error('{} can not FadeDown as it is currently at minimum'.format(self.name))
+            LOGGER.error('%s can not FadeDown as it is currently at minimum', self.name)
             return
         new_color[2] = BR_MIN
         try:
             if self.current_zone == 0:
-                self.device.set_color(new_color, FADE_INTERVAL, rapid=False)
+                _retry(self.device.set_color, new_color, FADE_INTERVAL, rapid=False)
             else:
-                self.device.set_zone_color(zone, zone, new_color, FADE_INTERVAL, rapid=False)
+                _retry(self.device.set_zone_color, zone, zone, new_color, FADE_INTERVAL, rapid=False)
         except lifxlan.WorkflowException as ex:
-            LOGGER.error('Connection Error {} bulb Fade Down. This happens from time to time, normally safe to ignore. {}'.format(self.name, str(ex)))
+            LOGGER.error('Connection Error %s bulb Fade Down. This happens from time to time, normally safe to ignore. %s', self.name, ex)
 
     def fade_stop(self, command):
-        zone = deepcopy(self.current_zone)
-        if self.current_zone != 0: zone -= 1
+        zone = self.current_zone - 1 if self.current_zone else 0
         if self.power is False:
-            LOGGER.error('{} can not FadeStop as it is currently off'.format(self.name))
+            LOGGER.error('%s can not FadeStop as it is currently off', self.name)
             return
         # check current brightness level
         try:
-            self.color = self.device.get_color_zones()
+            self.color = _retry(self.device.get_color_zones)
         except Exception as ex:
-            LOGGER.error('Connection Error on getting {} multizone color. This happens from time to time, normally safe to ignore. {}'.format(self.name, str(ex)))
+            LOGGER.error('Connection Error on getting %s multizone color. This happens from time to time, normally safe to ignore. %s', self.name, ex)
         else:
-            for ind, driver in enumerate(('GV1', 'GV2', 'GV3', 'CLITEMP')):
-                self.setDriver(driver, self.color[zone][ind])
+            for driver, val in zip(_COLOR_DRIVERS, self.color[zone]):
+                self.setDriver(driver, val)
         if self.color[zone][2] == BR_MIN or self.color[zone][2] == BR_MAX:
-            LOGGER.error('{} can not FadeStop as it is currently at limit'.format(self.name))
+            LOGGER.error('%s can not FadeStop as it is currently at limit', self.name)
             return
         try:
             if self.current_zone == 0:
-                self.device.set_color(self.color[zone], 0, rapid=False)
+                _retry(self.device.set_color, self.color[zone], 0, rapid=False)
             else:
-                self.device.set_zone_color(zone, zone, self.color[zone], 0, rapid=False)
+                _retry(self.device.set_zone_color, zone, zone, self.color[zone], 0, rapid=False)
         except lifxlan.WorkflowException as ex:
-            LOGGER.error('Connection Error {} bulb Fade Stop. This happens from time to time, normally safe to ignore. {}'.format(self.name, str(ex)))
+            LOGGER.error('Connection Error %s bulb Fade Stop. This happens from time to time, normally safe to ignore. %s', self.name, ex)
+
+    def _flush_pending(self, cmd):
+        super()._flush_pending(cmd)
+        if cmd not in _STAGED_CMDS:
+            self._apply_now()
+
+    def _apply_now(self):
+        ''' Same as _flush_now() for staged zone edits, apply them on the input thread '''
+        with self._flush_lock:
+            timer, self._apply_timer = self._apply_timer, None
+        if timer is None:
+            return
+        timer.cancel()
+        timer.join()
+        self.apply(None)
 
     def apply(self, command):
+        with self._flush_lock:
+            if self._apply_timer is not None:
+                self._apply_timer.cancel()
+                self._apply_timer = None
+            if not self.pending:
+                LOGGER.debug('%s has no staged zone changes, ignoring apply', self.name)
+                return
+            self.color = [list(c) for c in self.new_color]
+            self.new_color = None
+            self.pending = False
         try:
-            if self.new_color:
-                self.color = deepcopy(self.new_color)
-                self.new_color = None
-            self.device.set_zone_colors(self.color, self.duration, rapid=True)
+            with self._send_lock:
+                if self.extended_mz:
+                    ''' SetExtendedColorZones carries up to 82 zones per packet '''
+                    _retry(self.device.extended_set_zone_color, self.color, duration=self.duration, rapid=False)
+                else:
+                    self.device.set_zone_colors(self.color, self.duration, rapid=True)
         except (lifxlan.WorkflowException, IOError) as ex:
-            LOGGER.error('Connection Error on setting {} bulb color. This happens from time to time, normally safe to ignore. {}'.format(self.name, str(ex)))
-        LOGGER.info('Received apply command for {}'.format(self.address))
-        self.pending = False
+            LOGGER.error('Connection Error on setting %s bulb color. This happens from time to time, normally safe to ignore. %s', self.name, ex)
+        LOGGER.info('Received apply command for %s', self.address)
 
     def setColor(self, command):
-        if self.connected:
-            try:
-                _color = int(command.get('value'))
-                zone = deepcopy(self.current_zone)
-                if self.current_zone != 0: zone -= 1
-                if self.current_zone == 0:
-                    self.device.set_color(COLORS[_color][1], self.duration, True)
-                else:
-                    self.device.set_zone_color(zone, zone, COLORS[_color][1], self.duration, True)
-                LOGGER.info('Received SetColor command from ISY. Changing {} color to: {}'.format(self.address, COLORS[_color][0]))
-            except (lifxlan.WorkflowException, IOError) as ex:
-                LOGGER.error('mz setcolor error {}'.format(str(ex)))
-            for ind, driver in enumerate(('GV1', 'GV2', 'GV3', 'CLITEMP')):
-                self.setDriver(driver, COLORS[_color][1][ind])
-        else: LOGGER.info('Received SetColor, however the bulb is in a disconnected state... ignoring')
+        try:
+            _color = int(command.get('value'))
+            zone = self.current_zone - 1 if self.current_zone else 0
+            if self.current_zone == 0:
+                _retry(self.device.set_color, COLORS[_color][1], self.duration, rapid=False)
+            else:
+                _retry(self.device.set_zone_color, zone, zone, COLORS[_color][1], self.duration, rapid=False)
+            LOGGER.info('Received SetColor command from ISY. Changing %s color to: %s', self.address, COLORS[_color][0])
+        except (lifxlan.WorkflowException, IOError) as ex:
+            LOGGER.error('mz setcolor error %s', ex)
+        for driver, val in zip(_COLOR_DRIVERS, COLORS[_color][1]):
+            self.setDriver(driver, val)
 
     def setManual(self, command):
-        if self.connected:
-            _cmd = command.get('cmd')
-            _val = int(command.get('value'))
+        _cmd = command.get('cmd')
+        _val = int(command.get('value'))
+        ind = _CMD_TO_IDX.get(_cmd)
+        driver = None
+        if _cmd == 'SETZ':
+            self.current_zone = int(_val)
+            if self.current_zone > self.num_zones: self.current_zone = 0
+            driver = ['GV4', self.current_zone]
+        elif _cmd == 'RR':
+            self.duration = _val
+            driver = ['RR', self.duration]
+        if ind is not None:
+            zone = self.current_zone - 1 if self.current_zone else 0
             try:
-                if _cmd == 'SETZ':
-                    self.current_zone = int(_val)
-                    if self.current_zone > self.num_zones: self.current_zone = 0
-                    driver = ['GV4', self.current_zone]
-                zone = deepcopy(self.current_zone)
-                if self.current_zone != 0: zone -= 1
                 new_color = list(self.color[zone])
-                if _cmd == 'SETH':
-                    new_color[0] = int(_val)
-                    driver = ['GV1', new_color[0]]
-                elif _cmd == 'SETS':
-                    new_color[1] = int(_val)
-                    driver = ['GV2', new_color[1]]
-                elif _cmd == 'SETB':
-                    new_color[2] = int(_val)
-                    driver = ['GV3', new_color[2]]
-                elif _cmd == 'CLITEMP':
-                    new_color[3] = int(_val)
-                    driver = ['CLITEMP', new_color[3]]
-                elif _cmd == 'RR':
-                    self.duration = _val
-                    driver = ['RR', self.duration]
+                new_color[ind] = _val
                 self.color[zone] = new_color
-                if self.current_zone == 0:
-                    self.device.set_color(new_color, self.duration, rapid=False)
+            except (TypeError, IndexError) as ex:
+                LOGGER.error('setmanual mz error %s', ex)
+            with self._flush_lock:
+                self._pending_edits[(self.current_zone, ind)] = _val
+            driver = [_COLOR_DRIVERS[ind], _val]
+        if _cmd != 'SETZ':
+            self._schedule_flush()
+        if driver:
+            self.setDriver(driver[0], driver[1])
+
+    def _flush_color(self):
+        ''' Pending edits are keyed by (current_zone, channel), send one packet per edited zone '''
+        by_zone = {}
+        for (cz, ind), val in self._take_pending_edits().items():
+            by_zone.setdefault(cz, {})[ind] = val
+        if not by_zone:
+            ''' Only the duration changed, resend the selected zone as before '''
+            by_zone[self.current_zone] = {}
+        for cz, edits in by_zone.items():
+            zone = cz - 1 if cz else 0
+            new_color = None
+            try:
+                new_color = list(self.color[zone])
+                for ind, val in edits.items():
+                    new_color[ind] = val
+                self.color[zone] = new_color
+                if cz == 0:
+                    _retry(self.device.set_color, new_color, self.duration, rapid=False)
                 else:
-                    self.device.set_zone_color(zone, zone, new_color, self.duration, rapid=False)
-            except (lifxlan.WorkflowException, TypeError) as ex:
-                LOGGER.error('setmanual mz error {}'.format(ex))
-            LOGGER.info('Received manual change, updating the mz bulb zone {} to: {} duration: {}'.format(zone, new_color, self.duration))
-            if driver:
-                self.setDriver(driver[0], driver[1])
-        else: LOGGER.info('Received manual change, however the mz bulb is in a disconnected state... ignoring')
+                    _retry(self.device.set_zone_color, zone, zone, new_color, self.duration, rapid=False)
+            except (lifxlan.WorkflowException, IOError, TypeError, IndexError) as ex:
+                LOGGER.error('setmanual mz error %s', ex)
+            LOGGER.info('Received manual change, updating the mz bulb zone %s to: %s duration: %s', zone, new_color, self.duration)
 
     def setHSBKDZ(self, command):
+        ''' Zone edits are only staged here, APPLY or the auto-apply timer sends them together
+            as SetExtendedColorZones (one packet per 82 zones) or set_zone_colors on older strips '''
         query = command.get('query')
-        if not self.pending:
-            self.new_color = deepcopy(self.color)
-            self.pending = True
         current_zone = int(query.get('Z.uom56'))
-        zone = deepcopy(current_zone)
-        if current_zone != 0: zone -= 1
-        self.new_color[zone] = [int(query.get('H.uom56')), int(query.get('S.uom56')), int(query.get('B.uom56')), int(query.get('K.uom26'))]
+        color = _parse_hsbk(query)
         try:
             self.duration = int(query.get('D.uom42'))
         except TypeError:
             self.duration = 0
-        try:
-            if current_zone == 0:
-                self.device.set_color(self.new_color, self.duration, rapid=False)
-            else:
-                self.device.set_zone_color(zone, zone, self.new_color, self.duration, rapid=False, apply = 0)
-        except (lifxlan.WorkflowException, IOError) as ex:
-            LOGGER.error('set mz hsbkdz error %s', str(ex))
+        with self._flush_lock:
+            if not self.pending:
+                self.new_color = [list(c) for c in self.color]
+                self.pending = True
+            ''' Re-arm on every edit so a batch is applied together once edits stop arriving '''
+            if self._apply_timer is not None:
+                self._apply_timer.cancel()
+            self._apply_timer = Timer(APPLY_INTERVAL, self.apply, args=(None,))
+            self._apply_timer.daemon = True
+            self._apply_timer.start()
+            try:
+                if current_zone == 0:
+                    self.new_color = [list(color) for _ in self.new_color]
+                else:
+                    self.new_color[current_zone - 1] = color
+            except IndexError as ex:
+                LOGGER.error('set mz hsbkdz error %s', ex)
 
     def set_effect(self, command):
         query = command.get('query')
@@ -1002,7 +1234,7 @@ class MultiZone(Light):
         try:
             self.device.set_multizone_effect(effect_type=effect_type, speed=effect_speed, duration=effect_duration, parameters=parameters)
         except (lifxlan.WorkflowException, TypeError) as ex:
-            LOGGER.error('set_effect error {}'.format(ex))
+            LOGGER.error('set_effect error %s', ex)
 
 
     commands = {
@@ -1043,21 +1275,22 @@ class Tile(Light):
         self.controller = self.poly.getNode(self.primary)
         self.tile_count = 0
         self.effect = 0
+        self._morph_palette = None
 
     def start(self):
         try:
-            self.tile_count = self.device.get_tile_count()
+            self.tile_count = _retry(self.device.get_tile_count)
         except Exception as ex:
-            LOGGER.error(f'Failed to get tile count for {self.name}: {ex}')
+            LOGGER.error('Failed to get tile count for %s: %s', self.name, ex)
         self.setDriver('GV8', self.tile_count)
         super().start()
 
     def update(self):
         effect = None
         try:
-            effect = self.device.get_tile_effect()
+            effect = _retry(self.device.get_tile_effect)
         except Exception as ex:
-            LOGGER.error(f'Failed to get {self.name} effect {ex}')
+            LOGGER.error('Failed to get %s effect %s', self.name, ex)
         if effect is not None:
             if int(effect['type']) > 0:
                 self.effect = int(effect['type']) - 1
@@ -1069,9 +1302,9 @@ class Tile(Light):
     def save_state(self, command):
         mem_index = str(command.get('value'))
         try:
-            color_array = self.device.get_tilechain_colors()
+            color_array = _retry(self.device.get_tilechain_colors)
         except Exception as ex:
-            LOGGER.error(f'Failed to retrieve colors for {self.name}: {ex}')
+            LOGGER.error('Failed to retrieve colors for %s: %s', self.name, ex)
             return
         ''' Create structure for color storage'''
         if 'saved_tile_colors' not in self.controller.cust_data:
@@ -1083,23 +1316,23 @@ class Tile(Light):
 
     def recall_state(self, command):
         if self.effect > 0:
-            LOGGER.info(f'{self.name} is running effect, stopping effect before recall_state()')
+            LOGGER.info('%s is running effect, stopping effect before recall_state()', self.name)
             try:
                 self.device.set_tile_effect(effect_type=0, speed=3000, duration=0, palette=[])
             except Exception as ex:
-                LOGGER.error(f'Failed to stop {self.name} effect')
+                LOGGER.error('Failed to stop %s effect', self.name)
             self.effect = 0
             self.setDriver('GV9', self.effect)
         mem_index = str(command.get('value'))
         try:
             color_array = self.controller.cust_data['saved_tile_colors'][self.address][mem_index]
         except Exception as ex:
-            LOGGER.error(f'Failed to retrieve saved tile colors {mem_index} for {self.name}: {ex}')
+            LOGGER.error('Failed to retrieve saved tile colors %s for %s: %s', mem_index, self.name, ex)
             return
         try:
-            self.device.set_tilechain_colors(color_array, self.duration)
+            _retry(self.device.set_tilechain_colors, color_array, self.duration)
         except Exception as ex:
-            LOGGER.error(f'Failed to set tile colors for {self.name}: {ex}')
+            LOGGER.error('Failed to set tile colors for %s: %s', self.name, ex)
 
     def set_tile_effect(self, command):
         query = command.get('query')
@@ -1114,8 +1347,9 @@ class Tile(Light):
             effect_type += 1
         if effect_type == 2:
             brightness = int(query.get('B.uom56'))
-            palette = [(0, 65535, brightness, 3500), (7281, 65535, brightness, 3500), (10922, 65535, brightness, 3500), (22209, 65535, brightness, 3500),
-                       (43507, 65535, brightness, 3500), (49333, 65535, brightness, 3500), (53520, 65535, brightness, 3500)]
+            if self._morph_palette is None or self._morph_palette[0] != brightness:
+                self._morph_palette = (brightness, [(h, 65535, brightness, _MORPH_K) for h in _MORPH_HUES])
+            palette = self._morph_palette[1]
         else:
             palette = []
         effect_speed = int(query.get('ES.uom42'))
@@ -1124,7 +1358,7 @@ class Tile(Light):
         try:
             self.device.set_tile_effect(effect_type=effect_type, speed=effect_speed, duration=effect_duration, palette=palette)
         except (lifxlan.WorkflowException, TypeError) as ex:
-            LOGGER.error('set_tile_effect error {}'.format(ex))
+            LOGGER.error('set_tile_effect error %s', ex)
 
     drivers = [{'driver': 'ST', 'value': 0, 'uom': 51},
                 {'driver': 'GV0', 'value': 0, 'uom': 56},
@@ -1191,32 +1425,32 @@ class Group(udi_interface.Node):
         try:
             self.lifxGroup.set_power(True,rapid=True)
         except lifxlan.WorkflowException as ex:
-            LOGGER.error('Error on setting {} power. This happens from time to time, normally safe to ignore. {}'.format(self.name, str(ex)))
+            LOGGER.error('Error on setting %s power. This happens from time to time, normally safe to ignore. %s', self.name, ex)
 
     def setOn(self, command):
         try:
             self.lifxGroup.set_power(True, rapid = True)
         except (lifxlan.WorkflowException, IOError) as ex:
-            LOGGER.error('group seton error caught %s', str(ex))
+            LOGGER.error('group seton error caught %s', ex)
         else:
-            LOGGER.info('Received SetOn command for group {} from ISY. Setting all {} members to ON.'.format(self.label, self.numMembers))
+            LOGGER.info('Received SetOn command for group %s from ISY. Setting all %s members to ON.', self.label, self.numMembers)
 
     def setOff(self, command):
         try:
             self.lifxGroup.set_power(False, rapid = True)
         except (lifxlan.WorkflowException, IOError) as e:
-            LOGGER.error('group setoff error caught {}'.format(str(e)))
+            LOGGER.error('group setoff error caught %s', e)
         else:
-            LOGGER.info('Received SetOff command for group {} from ISY. Setting all {} members to OFF.'.format(self.label, self.numMembers))
+            LOGGER.info('Received SetOff command for group %s from ISY. Setting all %s members to OFF.', self.label, self.numMembers)
 
     def setColor(self, command):
         _color = int(command.get('value'))
         try:
             self.lifxGroup.set_color(COLORS[_color][1], 0, rapid = True)
         except (lifxlan.WorkflowException, IOError) as ex:
-            LOGGER.error('group setcolor error caught %s', str(ex))
+            LOGGER.error('group setcolor error caught %s', ex)
         else:
-            LOGGER.info('Received SetColor command for group {} from ISY. Changing color to: {} for all {} members.'.format(self.name, COLORS[_color][0], self.numMembers))
+            LOGGER.info('Received SetColor command for group %s from ISY. Changing color to: %s for all %s members.', self.name, COLORS[_color][0], self.numMembers)
             self._power_on_change()
 
     def setHue(self, command):
@@ -1224,9 +1458,9 @@ class Group(udi_interface.Node):
         try:
             self.lifxGroup.set_hue(_hue, 0, rapid = True)
         except (lifxlan.WorkflowException, IOError) as ex:
-            LOGGER.error('group sethue error caught %s', str(ex))
+            LOGGER.error('group sethue error caught %s', ex)
         else:
-            LOGGER.info('Received SetHue command for group {} from ISY. Changing hue to: {} for all {} members.'.format(self.name, _hue, self.numMembers))
+            LOGGER.info('Received SetHue command for group %s from ISY. Changing hue to: %s for all %s members.', self.name, _hue, self.numMembers)
             self._power_on_change()
 
     def setSat(self, command):
@@ -1234,9 +1468,9 @@ class Group(udi_interface.Node):
         try:
             self.lifxGroup.set_saturation(_sat, 0, rapid = True)
         except (lifxlan.WorkflowException, IOError) as ex:
-            LOGGER.error('group setsaturation error caught %s', str(ex))
+            LOGGER.error('group setsaturation error caught %s', ex)
         else:
-            LOGGER.info('Received SetSat command for group {} from ISY. Changing saturation to: {} for all {} members.'.format(self.name, _sat, self.numMembers))
+            LOGGER.info('Received SetSat command for group %s from ISY. Changing saturation to: %s for all %s members.', self.name, _sat, self.numMembers)
             self._power_on_change()
 
     def setBri(self, command):
@@ -1244,9 +1478,9 @@ class Group(udi_interface.Node):
         try:
             self.lifxGroup.set_brightness(_bri, 0, rapid = True)
         except (lifxlan.WorkflowException, IOError) as ex:
-            LOGGER.error('group setbrightness error caught %s', str(ex))
+            LOGGER.error('group setbrightness error caught %s', ex)
         else:
-            LOGGER.info('Received SetBri command for group {} from ISY. Changing brightness to: {} for all {} members.'.format(self.name, _bri, self.numMembers))
+            LOGGER.info('Received SetBri command for group %s from ISY. Changing brightness to: %s for all %s members.', self.name, _bri, self.numMembers)
             self._power_on_change()
 
     def setCTemp(self, command):
@@ -1254,9 +1488,9 @@ class Group(udi_interface.Node):
         try:
             self.lifxGroup.set_colortemp(_ctemp, 0, rapid = True)
         except (lifxlan.WorkflowException, IOError) as ex:
-            LOGGER.error('group setcolortemp error caught %s', str(ex))
+            LOGGER.error('group setcolortemp error caught %s', ex)
         else:
-            LOGGER.info('Received SetCTemp command for group {} from ISY. Changing color temperature to: {} for all {} members.'.format(self.name, _ctemp, self.numMembers))
+            LOGGER.info('Received SetCTemp command for group %s from ISY. Changing color temperature to: %s for all %s members.', self.name, _ctemp, self.numMembers)
             self._power_on_change()
 
     def set_ir_brightness(self, command):
@@ -1264,15 +1498,15 @@ class Group(udi_interface.Node):
         try:
             self.lifxGroup.set_infrared(_val)
         except (lifxlan.WorkflowException, IOError) as ex:
-            LOGGER.error('group set_infrared_brightness error caught %s', str(ex))
+            LOGGER.error('group set_infrared_brightness error caught %s', ex)
         else:
-            LOGGER.info('Received SetIR command for group {} from ISY. Changing infrared brightness to: {} for all {} members.'.format(self.name, _val, self.numMembers))
+            LOGGER.info('Received SetIR command for group %s from ISY. Changing infrared brightness to: %s for all %s members.', self.name, _val, self.numMembers)
             self._power_on_change()
 
     def setHSBKD(self, command):
         query = command.get('query')
         try:
-            color = [int(query.get('H.uom56')), int(query.get('S.uom56')), int(query.get('B.uom56')), int(query.get('K.uom26'))]
+            color = _parse_hsbk(query)
             duration = int(query.get('D.uom42'))
         except TypeError:
             duration = 0
@@ -1280,9 +1514,9 @@ class Group(udi_interface.Node):
         try:
             self.lifxGroup.set_color(color, duration = duration, rapid = True)
         except (lifxlan.WorkflowException, IOError) as ex:
-            LOGGER.error('group sethsbkd error caught {}'.format(str(ex)))
+            LOGGER.error('group sethsbkd error caught %s', ex)
         else:
-            LOGGER.info('Recieved SetHSBKD command for group {} from ISY, Setting all members to Color {}, duration {}'.format(self.label, color, duration))
+            LOGGER.info('Recieved SetHSBKD command for group %s from ISY, Setting all members to Color %s, duration %s', self.label, color, duration)
             self._power_on_change()
 
     drivers = [{'driver': 'ST', 'value': 0, 'uom': 56}]